@@ -8,17 +8,39 @@
 
 import sys
 import os
+import fcntl
+import atexit
+import errno
+import functools
 import subprocess
 import shlex
+import signal
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
 from simple_term_menu import TerminalMenu
 import shutil
 from yaspin import yaspin
 
+try:
+    # Optional: answers read-only git queries in-process when installed
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 # Command to launch the workspace session (e.g., zellij, tmux, etc.)
 WORKSPACE_CMD = []
 # Untracked paths to copy into newly created worktrees (relative to CWD).
 COPY_UNTRACKED_PATHS = ["DerivedData"]
+# Linux ioctl that makes one file a copy-on-write clone of another.
+FICLONE = 0x40049409
+# FICLONE errors meaning the filesystem can't clone at all.
+REFLINK_UNSUPPORTED_ERRNOS = (errno.EOPNOTSUPP, errno.EINVAL, errno.ENOTTY, errno.EXDEV)
+# Cleared after the first such error so later files go straight to copy2.
+reflink_supported = sys.platform == "linux"
+# Serializes access to the shared pygit2 repository and ref resolver process.
+git_lock = threading.Lock()
 
 
 @contextmanager
@@ -28,23 +50,30 @@ def status(text):
         yield sp
 
 
-def run_command(cmd, cwd=None, check=True, input=None):
-    """Run a shell command and return the result."""
+def run_command(cmd, cwd=None, check=True, input=None, capture=True):
+    """Run a command (an argv list) and return the result.
+
+    With capture=False stdout is discarded; stderr is still kept for errors.
+    """
     result = subprocess.run(
-        cmd, shell=True, capture_output=True, text=True, cwd=cwd, input=input
+        cmd,
+        stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        cwd=cwd,
+        input=input,
     )
     if check and result.returncode != 0:
-        print(f"Error running command: {cmd}")
+        print(f"Error running command: {shlex.join(cmd)}")
         print(f"Error: {result.stderr}")
         sys.exit(1)
     return result
 
 
 def run_command_stream(cmd, cwd=None, on_output=None):
-    """Run a shell command and stream its output line-by-line."""
+    """Run a command (an argv list) and stream its output line-by-line."""
     process = subprocess.Popen(
         cmd,
-        shell=True,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
@@ -60,6 +89,34 @@ def run_command_stream(cmd, cwd=None, on_output=None):
     return returncode, "".join(output)
 
 
+@functools.cache
+def get_shell():
+    """Resolve the user's login shell to an executable path."""
+    shell = os.environ.get("SHELL", "/bin/bash")
+    return shutil.which(shell) or shell
+
+
+def exec_workspace():
+    """Run the workspace command, then replace this process with the shell."""
+    shell = get_shell()
+    if WORKSPACE_CMD:
+        # The workspace command owns the terminal; let it handle Ctrl-C
+        previous_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+        try:
+            pid = os.posix_spawnp(
+                WORKSPACE_CMD[0],
+                WORKSPACE_CMD,
+                os.environ,
+                setsigdef=(signal.SIGINT,),
+            )
+            os.waitpid(pid, 0)
+        except OSError as e:
+            print(f"Error running workspace command: {e}")
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
+    os.execvp(shell, [shell])
+
+
 def copy_untracked_paths(source_dir, target_dir):
     for rel_path in COPY_UNTRACKED_PATHS:
         src_path = os.path.join(source_dir, rel_path)
@@ -71,21 +128,111 @@ def copy_untracked_paths(source_dir, target_dir):
         else:
             os.makedirs(os.path.dirname(dst_path), exist_ok=True)
             try:
-                shutil.copy2(src_path, dst_path)
+                clone_or_copy_file(src_path, dst_path)
             except FileNotFoundError:
                 # File disappeared between exists check and copy; skip.
                 pass
 
 
-def copy_dir_best_effort(src_dir, dst_dir):
-    """Try a fast APFS clone via ditto --clone; skip on failure."""
-    if sys.platform != "darwin" or not shutil.which("ditto"):
-        print("DerivedData copy skipped: ditto not available.")
-        return
+def clone_or_copy_file(src, dst):
+    """Copy a file as a copy-on-write clone when the filesystem supports it."""
+    global reflink_supported
+    # Only clone regular files; opening a FIFO would block, so leave special
+    # files to copy2, which refuses them
+    if reflink_supported and stat.S_ISREG(os.stat(src).st_mode):
+        try:
+            with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+                fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError as e:
+            if e.errno in REFLINK_UNSUPPORTED_ERRNOS:
+                # Not Btrfs/XFS (or a cross-device copy); stop trying to clone
+                reflink_supported = False
+    return shutil.copy2(src, dst)
+
+
+def _scan(src_dir, dst_dir):
+    """Yield (entry, dst_path) for everything below src_dir, parents first."""
+    pending = [(src_dir, dst_dir)]
+    while pending:
+        src, dst = pending.pop()
+        try:
+            with os.scandir(src) as entries:
+                for entry in entries:
+                    target = os.path.join(dst, entry.name)
+                    # d_type from the directory listing; no extra stat call
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, target))
+                    yield entry, target
+        except OSError:
+            # Unreadable directory; skip it like os.walk would
+            continue
+
+
+def copy_tree_parallel(src_dir, dst_dir):
+    """Copy a directory tree, fanning file copies out over a thread pool.
+
+    Returns the number of entries that could not be copied.
+    """
+    failures = 0
+    files = []
+    failed_dirs = set()
+    # Directories and symlinks are cheap, so create them up front
+    try:
+        os.makedirs(dst_dir, exist_ok=True)
+    except OSError:
+        return 1
+    for entry, dst in _scan(src_dir, dst_dir):
+        if os.path.dirname(dst) in failed_dirs:
+            # Its directory couldn't be created; skip the whole subtree
+            failed_dirs.add(dst)
+            continue
+        if entry.is_dir(follow_symlinks=False):
+            try:
+                os.makedirs(dst, exist_ok=True)
+            except OSError:
+                failures += 1
+                failed_dirs.add(dst)
+        elif entry.is_symlink():
+            try:
+                os.symlink(os.readlink(entry.path), dst)
+            except OSError:
+                failures += 1
+        elif entry.is_file(follow_symlinks=False):
+            files.append((entry.path, dst))
+        else:
+            # FIFOs, sockets and device nodes can't be copied
+            failures += 1
 
+    def copy_file(paths):
+        try:
+            clone_or_copy_file(*paths)
+        except OSError:
+            # Includes files that disappeared since the walk; skip them.
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+        failures += sum(not copied for copied in pool.map(copy_file, files))
+    return failures
+
+
+def copy_dir_best_effort(src_dir, dst_dir):
+    """Clone src_dir into dst_dir, copy-on-write where possible; skip on failure."""
     os.makedirs(os.path.dirname(dst_dir), exist_ok=True)
     base_text = "Copying DerivedData"
 
+    if sys.platform != "darwin" or not shutil.which("ditto"):
+        with status(base_text) as sp:
+            failures = copy_tree_parallel(src_dir, dst_dir)
+            if failures:
+                sp.fail("DerivedData copy incomplete")
+                print(f"{failures} entries could not be copied")
+            else:
+                sp.ok("Done")
+        return
+
     def update_spinner(line):
         entry = line.strip()
         if not entry:
@@ -117,7 +264,7 @@ def copy_dir_best_effort(src_dir, dst_dir):
 
     with status(base_text) as sp:
         returncode, output = run_command_stream(
-            f"ditto --clone -V {shlex.quote(src_dir)} {shlex.quote(dst_dir)}",
+            ["ditto", "--clone", "-V", src_dir, dst_dir],
             on_output=update_spinner,
         )
         if returncode != 0:
@@ -129,73 +276,246 @@ def copy_dir_best_effort(src_dir, dst_dir):
             sp.ok("Done")
 
 
+@functools.cache
 def get_git_root():
     """Get the root directory of the current git repository."""
-    result = run_command("git rev-parse --show-toplevel")
-    return result.stdout.strip()
+    git_root = find_git_root()
+    if git_root is None:
+        # Let git resolve unusual layouts (GIT_DIR, bare repos, etc.)
+        result = run_command(["git", "rev-parse", "--show-toplevel"])
+        git_root = result.stdout.strip()
+    return git_root
+
+
+def find_git_root():
+    """Walk up from the current directory looking for a .git entry."""
+    if any(
+        var in os.environ
+        for var in ("GIT_DIR", "GIT_WORK_TREE", "GIT_CEILING_DIRECTORIES")
+    ):
+        return None
+
+    current = os.getcwd()
+    while True:
+        dot_git = os.path.join(current, ".git")
+        if os.path.isdir(dot_git):
+            return current
+        if os.path.isfile(dot_git):
+            # Linked worktrees point at their git dir with "gitdir: <path>"
+            with open(dot_git) as f:
+                if f.readline().startswith("gitdir: "):
+                    return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        current = parent
 
 
 
 
+@functools.cache
+def get_repo():
+    """Open the current repository with pygit2, or None to fall back to git."""
+    if pygit2 is None:
+        return None
+    path = pygit2.discover_repository(os.getcwd())
+    if path is None:
+        return None
+    try:
+        return pygit2.Repository(path)
+    except pygit2.GitError:
+        return None
+
+
+def get_worktrees_container(git_root):
+    """Get the directory that holds the worktrees created for git_root."""
+    parent_dir = os.path.dirname(git_root)
+    repo_name = os.path.basename(git_root)
+    return os.path.join(parent_dir, f"{repo_name}-worktrees")
+
+
+def read_head_branch(git_dir):
+    """Read the branch HEAD in git_dir points to, or None if it is detached."""
+    try:
+        with open(os.path.join(git_dir, "HEAD")) as f:
+            head = f.readline().strip()
+    except OSError:
+        return None
+    if not head.startswith("ref: refs/heads/"):
+        return None
+    return head[len("ref: refs/heads/") :]
+
+
+def read_worktree_branch(path):
+    """Read the branch checked out in a linked worktree without running git."""
+    try:
+        with open(os.path.join(path, ".git")) as f:
+            line = f.readline().strip()
+    except OSError:
+        return None
+    if not line.startswith("gitdir: "):
+        return None
+    return read_head_branch(os.path.join(path, line[len("gitdir: ") :]))
+
+
 def get_worktree_path(branch_name):
     """Check if a worktree exists for the given branch and return its path."""
-    result = run_command("git worktree list --porcelain")
-    lines = result.stdout.strip().split("\n")
-    
-    # Get the main repository path to exclude it
-    git_root = get_git_root()
+    # Fast path: worktrees made by `create` live at a predictable location
+    expected_path = os.path.join(get_worktrees_container(get_git_root()), branch_name)
+    if read_worktree_branch(expected_path) == branch_name:
+        return expected_path
+
+    for branch, path in get_all_worktrees():
+        if branch == branch_name:
+            return path
+    return None
 
-    current_worktree = None
-    for line in lines:
-        if line.startswith("worktree "):
-            current_worktree = line.split(" ", 1)[1]
-        elif line.startswith("branch ") and current_worktree:
-            branch = line.split(" ", 1)[1]
-            if branch == f"refs/heads/{branch_name}":
-                # Don't return the main repository as a worktree
-                if current_worktree != git_root:
-                    return current_worktree
-            current_worktree = None
 
-    return None
+def _worktrees_from_repo(repo):
+    """Build the same records as _worktrees_raw from a pygit2 repository."""
+    git_dir = os.path.normpath(repo.path)
+    commondir_file = os.path.join(git_dir, "commondir")
+    if os.path.isfile(commondir_file):
+        # Opened from a linked worktree; list from the main repository
+        with open(commondir_file) as f:
+            git_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+        repo = pygit2.Repository(git_dir)
+
+    if repo.is_bare:
+        main = {"path": git_dir, "branch": None, "bare": True, "detached": False}
+    else:
+        branch = None
+        if not repo.head_is_detached:
+            branch = repo.references["HEAD"].target.removeprefix("refs/heads/")
+        main = {
+            "path": os.path.normpath(repo.workdir),
+            "branch": branch,
+            "bare": False,
+            "detached": repo.head_is_detached,
+        }
+    worktrees = [main]
+
+    # git lists linked worktrees sorted by path
+    linked = sorted(
+        (repo.lookup_worktree(name).path, name) for name in repo.list_worktrees()
+    )
+    for path, name in linked:
+        # Read HEAD from the admin dir, which outlives a deleted worktree dir
+        branch = read_head_branch(os.path.join(git_dir, "worktrees", name))
+        worktrees.append(
+            {
+                "path": path,
+                "branch": branch,
+                "bare": False,
+                "detached": branch is None,
+            }
+        )
+    return worktrees
+
+
+# How each attribute line of a porcelain worktree record is stored
+WORKTREE_ATTRIBUTES = {
+    "branch": ("branch", lambda value: value.removeprefix("refs/heads/")),
+    "bare": ("bare", lambda value: True),
+    "detached": ("detached", lambda value: True),
+}
+
+
+@functools.cache
+def _worktrees_raw():
+    """Parse `git worktree list --porcelain` into one dict per worktree."""
+    repo = get_repo()
+    if repo is not None:
+        return _worktrees_from_repo(repo)
+    porcelain = run_command(["git", "worktree", "list", "--porcelain"]).stdout
+
+    worktrees = []
+    entry = None
+    for line in porcelain.split("\n"):
+        if not line:
+            # Each record is terminated by a blank line
+            if entry:
+                worktrees.append(entry)
+            entry = None
+            continue
+
+        key, _, value = line.partition(" ")
+        if key == "worktree":
+            entry = {"path": value, "branch": None, "bare": False, "detached": False}
+            continue
+        attribute = WORKTREE_ATTRIBUTES.get(key)
+        if attribute and entry is not None:
+            field, parse = attribute
+            entry[field] = parse(value)
+
+    if entry:
+        worktrees.append(entry)
+    return worktrees
 
 
 def get_all_worktrees():
     """Get all worktrees with their branch names."""
-    result = run_command("git worktree list --porcelain")
-    lines = result.stdout.strip().split("\n")
-    
     # Get the main repository path to exclude it
     git_root = get_git_root()
 
     worktrees = []
-    current_worktree = None
-    current_path = None
-    is_bare = False
-
-    for line in lines:
-        if line.startswith("worktree "):
-            current_path = line.split(" ", 1)[1]
-        elif line.startswith("branch ") and current_path:
-            branch = line.split(" ", 1)[1]
-            if branch.startswith("refs/heads/"):
-                branch_name = branch.replace("refs/heads/", "")
-                # Only include actual worktrees, not the main repository
-                if current_path != git_root:
-                    worktrees.append((branch_name, current_path))
-            current_path = None
-        elif line == "bare":
-            is_bare = True
-
+    for entry in _worktrees_raw():
+        # Only include actual worktrees, not the main repository
+        if entry["branch"] and entry["path"] != git_root:
+            worktrees.append((entry["branch"], entry["path"]))
     return worktrees
 
 
-def branch_exists(branch_name):
-    """Check if a branch exists."""
+@functools.cache
+def ref_resolver():
+    """Start a long-running git process that resolves refs on stdin."""
+    process = subprocess.Popen(
+        ["git", "cat-file", "--batch-check=%(objectname) %(objecttype)"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+
+    # Closing stdin tells git to exit; communicate() also reaps it
+    atexit.register(process.communicate)
+    return process
+
+
+def resolve_ref(ref):
+    """Get the object name a ref points to, or None if it doesn't exist."""
+    repo = get_repo()
+    if repo is not None:
+        with git_lock:
+            reference = repo.references.get(ref)
+            return str(reference.resolve().target) if reference else None
+
+    process = ref_resolver()
+    with git_lock:
+        process.stdin.write(f"{ref}\n")
+        process.stdin.flush()
+        line = process.stdout.readline()
+    object_name, _, object_type = line.strip().rpartition(" ")
+    if not object_name or object_type in ("missing", "ambiguous"):
+        return None
+    return object_name
+
+
+@functools.cache
+def _all_local_branches():
+    """Get the names of all local branches."""
+    repo = get_repo()
+    if repo is not None:
+        return set(repo.branches.local)
     result = run_command(
-        f"git show-ref --verify --quiet refs/heads/{branch_name}", check=False
+        ["git", "for-each-ref", "--format=%(refname:lstrip=2)", "refs/heads/"]
     )
-    return result.returncode == 0
+    return set(result.stdout.split())
+
+
+def branch_exists(branch_name):
+    """Check if a branch exists."""
+    return branch_name in _all_local_branches()
 
 
 def main():
@@ -203,25 +523,36 @@ def main():
         print("Usage: agent <command> [args]")
         print("Commands:")
         print("  create <branch-name>   Create and switch to a git worktree")
+        print(
+            "                         --attach-if-exists: attach if it already exists"
+        )
         print("  attach [branch-name]   Attach to an existing worktree")
         print("                         (interactive mode if no branch name given)")
-        print("  destroy [branch-name] [--force]  Remove worktree and delete branch")
+        print("  destroy [branch-name] [--force] [--fetch]")
+        print("                                   Remove worktree and delete branch")
         print(
             "                                   (interactive mode if no branch name given)"
         )
         print(
             "                                   --force: skip merge check and force delete"
         )
+        print(
+            "                                   --fetch: update origin/<branch> before checking"
+        )
         sys.exit(1)
 
     command = sys.argv[1]
 
     if command == "create":
-        if len(sys.argv) != 3:
-            print("Usage: agent create <branch-name>")
+        args = sys.argv[2:]
+        attach_if_exists = "--attach-if-exists" in args
+        if attach_if_exists:
+            args.remove("--attach-if-exists")
+        if len(args) != 1:
+            print("Usage: agent create <branch-name> [--attach-if-exists]")
             sys.exit(1)
-        branch_name = sys.argv[2]
-        create_worktree(branch_name)
+        branch_name = args[0]
+        create_worktree(branch_name, attach_if_exists=attach_if_exists)
     elif command == "attach":
         if len(sys.argv) > 3:
             print("Usage: agent attach [branch-name]")
@@ -236,6 +567,7 @@ def main():
             attach_worktree_interactive()
     elif command == "destroy":
         force = False
+        fetch = False
         branch_name = None
 
         # Parse arguments
@@ -244,39 +576,48 @@ def main():
         while i < len(args):
             if args[i] == "--force":
                 force = True
+            elif args[i] == "--fetch":
+                fetch = True
             else:
                 if branch_name is None:
                     branch_name = args[i]
                 else:
                     print("Error: Too many arguments")
-                    print("Usage: agent destroy [branch-name] [--force]")
+                    print("Usage: agent destroy [branch-name] [--force] [--fetch]")
                     sys.exit(1)
             i += 1
 
         if branch_name is None:
             # Interactive mode
-            destroy_worktree_interactive(force=force)
+            destroy_worktree_interactive(force=force, fetch=fetch)
         else:
             # Direct mode with branch name
-            destroy_worktree(branch_name, force=force)
+            destroy_worktree(branch_name, force=force, fetch=fetch)
     else:
         print(f"Unknown command: {command}")
         print("Usage: agent <command> [args]")
         print("Commands:")
         print("  create <branch-name>   Create and switch to a git worktree")
+        print(
+            "                         --attach-if-exists: attach if it already exists"
+        )
         print("  attach [branch-name]   Attach to an existing worktree")
         print("                         (interactive mode if no branch name given)")
-        print("  destroy [branch-name] [--force]  Remove worktree and delete branch")
+        print("  destroy [branch-name] [--force] [--fetch]")
+        print("                                   Remove worktree and delete branch")
         print(
             "                                   (interactive mode if no branch name given)"
         )
         print(
             "                                   --force: skip merge check and force delete"
         )
+        print(
+            "                                   --fetch: update origin/<branch> before checking"
+        )
         sys.exit(1)
 
 
-def create_worktree(branch_name):
+def create_worktree(branch_name, attach_if_exists=False):
     # Get current directory and git root
     current_dir = os.getcwd()
     git_root = get_git_root()
@@ -296,30 +637,37 @@ def create_worktree(branch_name):
     if worktree_path:
         # Worktree already exists, prompt the user
         print(f"Worktree '{branch_name}' already exists.")
-        response = input("Would you like to attach instead? (y/n): ").strip().lower()
+        if attach_if_exists:
+            response = "y"
+        elif not sys.stdin.isatty():
+            # Nobody is there to answer the prompt, so treat it as "no"
+            print("Not attaching without a terminal; pass --attach-if-exists.")
+            response = "n"
+        else:
+            response = input("Would you like to attach instead? (y/n): ")
 
-        if response != "y":
+        if response.strip().lower() != "y":
             print("Operation cancelled.")
             sys.exit(0)
     else:
         # Create branch if it doesn't exist
         if not branch_exists(branch_name):
             with status(f"Creating branch '{branch_name}' from '{parent_branch}'") as sp:
-                run_command(f"git checkout -b {branch_name}")
+                # Only write the ref; the worktree checkout happens below
+                run_command(["git", "branch", branch_name, "HEAD"], capture=False)
                 # Store the parent branch in the description
                 set_branch_parent(branch_name, parent_branch)
-                run_command("git checkout -")  # Switch back to original branch
                 sp.ok("Done")
 
         # Create worktree inside the worktrees container directory
-        parent_dir = os.path.dirname(git_root)
-        repo_name = os.path.basename(git_root)
-        worktrees_container = os.path.join(parent_dir, f"{repo_name}-worktrees")
+        worktrees_container = get_worktrees_container(git_root)
         os.makedirs(worktrees_container, exist_ok=True)
         worktree_dir = os.path.join(worktrees_container, branch_name)
 
         with status(f"Creating worktree at '{worktree_dir}'") as sp:
-            run_command(f"git worktree add '{worktree_dir}' '{branch_name}'")
+            run_command(
+                ["git", "worktree", "add", worktree_dir, branch_name], capture=False
+            )
             sp.ok("Done")
         worktree_path = worktree_dir
         created = True
@@ -338,9 +686,7 @@ def create_worktree(branch_name):
     os.chdir(target_dir)
     with status(f"Launching workspace in '{target_dir}'") as sp:
         sp.ok("Done")
-    shell = os.environ.get("SHELL", "/bin/bash")
-    workspace_cmd_str = shlex.join(WORKSPACE_CMD)
-    os.execvp(shell, [shell, "-c", f"{workspace_cmd_str}; exec {shell}"])
+    exec_workspace()
 
 
 def attach_worktree(branch_name):
@@ -372,9 +718,7 @@ def attach_worktree(branch_name):
     os.chdir(target_dir)
     with status(f"Attaching to worktree in '{target_dir}'") as sp:
         sp.ok("Done")
-    shell = os.environ.get("SHELL", "/bin/bash")
-    workspace_cmd_str = shlex.join(WORKSPACE_CMD)
-    os.execvp(shell, [shell, "-c", f"{workspace_cmd_str}; exec {shell}"])
+    exec_workspace()
 
 
 def attach_worktree_interactive():
@@ -410,26 +754,51 @@ def attach_worktree_interactive():
     attach_worktree(selected_branch)
 
 
+@functools.cache
 def get_current_branch():
     """Get the current branch name."""
-    result = run_command("git rev-parse --abbrev-ref HEAD")
-    return result.stdout.strip()
+    repo = get_repo()
+    if repo is not None and not repo.head_is_unborn:
+        return "HEAD" if repo.head_is_detached else repo.head.shorthand
+    # Strip refs/heads/ ourselves; rev-parse --abbrev-ref would give
+    # "heads/<name>" when a tag shares the branch's name
+    result = run_command(["git", "symbolic-ref", "--quiet", "HEAD"], check=False)
+    if result.returncode != 0:
+        # Detached HEAD
+        return "HEAD"
+    return result.stdout.strip().removeprefix("refs/heads/")
 
 
 def set_branch_parent(branch_name, parent_branch):
     """Set the parent branch in the branch description."""
     description = f"Parent branch: {parent_branch}"
-    run_command(f"git config branch.{branch_name}.description '{description}'")
+    run_command(
+        ["git", "config", f"branch.{branch_name}.description", description],
+        capture=False,
+    )
+
+
+@functools.cache
+def _all_branch_parents():
+    """Get the parent of every branch that records one in its description."""
+    result = run_command(
+        ["git", "config", "-z", "--get-regexp", r"^branch\..*\.description$"],
+        check=False,
+    )
+    parents = {}
+    # -z output is "<key>\n<value>" records separated by NULs
+    for record in result.stdout.split("\0"):
+        key, _, description = record.partition("\n")
+        branch_name = key.removeprefix("branch.").removesuffix(".description")
+        description = description.strip()
+        if description.startswith("Parent branch: "):
+            parents[branch_name] = description.replace("Parent branch: ", "").strip()
+    return parents
 
 
 def get_branch_parent(branch_name):
     """Get the parent branch from the branch description."""
-    result = run_command(f"git config branch.{branch_name}.description", check=False)
-    if result.returncode == 0 and result.stdout.strip():
-        description = result.stdout.strip()
-        if description.startswith("Parent branch: "):
-            return description.replace("Parent branch: ", "").strip()
-    return None
+    return _all_branch_parents().get(branch_name)
 
 
 def get_main_branch():
@@ -438,39 +807,55 @@ def get_main_branch():
         if branch_exists(branch):
             return branch
     # If none of the common main branches exist, use the first branch
-    result = run_command("git branch -r | grep -v HEAD | head -1")
-    if result.stdout.strip():
-        return result.stdout.strip().split("/")[-1]
+    result = run_command(["git", "branch", "-r"], check=False)
+    remote_branches = (
+        line.strip() for line in result.stdout.splitlines() if "HEAD" not in line
+    )
+    first_branch = next(remote_branches, None)
+    if first_branch:
+        return first_branch.split("/")[-1]
     return None
 
 
 def is_branch_merged(branch_name, target_branch):
     """Check if branch_name has been merged into target_branch."""
-    # Get the worktree path for the branch
-    worktree_path = get_worktree_path(branch_name)
-
-    # Run the command from within the worktree directory
+    repo = get_repo()
+    if repo is not None:
+        with git_lock:
+            # Look up local branches directly so a same-named tag can't win
+            branch_ref = repo.references.get(f"refs/heads/{branch_name}")
+            target_ref = repo.references.get(f"refs/heads/{target_branch}")
+            if branch_ref is None:
+                return False
+            try:
+                branch_id = branch_ref.peel(pygit2.Commit).id
+                if target_ref is None:
+                    target_ref = repo.revparse_single(target_branch)
+                target_id = target_ref.peel(pygit2.Commit).id
+            except (KeyError, ValueError, pygit2.GitError):
+                return False
+            return branch_id == target_id or repo.descendant_of(target_id, branch_id)
+
+    # Qualify local branches so a tag with the same name can't shadow them
+    branch_ref = f"refs/heads/{branch_name}"
+    target_ref = target_branch
+    if branch_exists(target_branch):
+        target_ref = f"refs/heads/{target_branch}"
     result = run_command(
-        f"git branch --merged {target_branch}", check=False, cwd=worktree_path
-    )
-    merged_branches = result.stdout.strip().split("\n")
-    return any(
-        branch.strip().strip("*").strip() == branch_name for branch in merged_branches
+        ["git", "merge-base", "--is-ancestor", branch_ref, target_ref], check=False
     )
+    return result.returncode == 0
 
 
 def get_remote_branch_tip(branch_name):
     """Get the tip commit hash for origin/branch_name, or None if it doesn't exist."""
-    result = run_command(f"git ls-remote --heads origin {branch_name}", check=False)
-    output = result.stdout.strip()
-    if not output:
-        return None
-    return output.split()[0]
+    # Uses the remote-tracking ref, which is only as fresh as the last fetch
+    return resolve_ref(f"refs/remotes/origin/{branch_name}")
 
 
 def is_branch_tip_pushed(branch_name):
     """Check if the local branch tip matches the remote tip."""
-    local_tip = run_command(f"git rev-parse {branch_name}", check=False).stdout.strip()
+    local_tip = resolve_ref(f"refs/heads/{branch_name}")
     if not local_tip:
         return False
     remote_tip = get_remote_branch_tip(branch_name)
@@ -479,7 +864,25 @@ def is_branch_tip_pushed(branch_name):
     return local_tip == remote_tip
 
 
-def destroy_worktree_interactive(force=False):
+def is_branch_preserved(branch_name, target_branch):
+    """Check if the branch is merged into target_branch or its tip is pushed."""
+    # Both checks are independent, so run them side by side
+    pool = ThreadPoolExecutor(max_workers=2)
+    futures = [
+        pool.submit(is_branch_merged, branch_name, target_branch),
+        pool.submit(is_branch_tip_pushed, branch_name),
+    ]
+    try:
+        for future in as_completed(futures):
+            if future.result():
+                return True
+        return False
+    finally:
+        # Once one check succeeds there is no need to wait for the other
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def destroy_worktree_interactive(force=False, fetch=False):
     """Interactive mode for destroying worktrees."""
     # Get all worktrees
     worktrees = get_all_worktrees()
@@ -491,7 +894,11 @@ def destroy_worktree_interactive(force=False):
     # Create menu options
     menu_options = []
     for branch_name, path in worktrees:
-        menu_options.append(branch_name)
+        parent_branch = get_branch_parent(branch_name)
+        if parent_branch:
+            menu_options.append(f"{branch_name} (from {parent_branch})")
+        else:
+            menu_options.append(branch_name)
 
     # Add cancel option
     menu_options.append("Cancel")
@@ -517,20 +924,23 @@ def destroy_worktree_interactive(force=False):
     confirm_index = confirm_menu.show()
 
     if confirm_index == 0:
-        destroy_worktree(selected_branch, force=force)
+        destroy_worktree(selected_branch, force=force, fetch=fetch)
     else:
         print("Cancelled.")
 
 
 def has_unstaged_changes(cwd=None):
     """Check if there are unstaged changes or untracked files in the working directory."""
-    result = run_command("git status --porcelain", check=False, cwd=cwd)
+    # Only emptiness matters, so skip rename detection
+    result = run_command(
+        ["git", "status", "--porcelain", "--no-renames"], check=False, cwd=cwd
+    )
     return bool(result.stdout.strip())
 
 
 
 
-def destroy_worktree(branch_name, force=False):
+def destroy_worktree(branch_name, force=False, fetch=False):
     # Check if worktree exists
     worktree_path = get_worktree_path(branch_name)
     if not worktree_path:
@@ -560,10 +970,20 @@ def destroy_worktree(branch_name, force=False):
         print(f"Using '{parent_branch}' as the parent branch")
 
     if not force:
+        if fetch:
+            with status(f"Fetching '{branch_name}' from origin") as sp:
+                result = run_command(
+                    ["git", "fetch", "origin", branch_name], check=False, capture=False
+                )
+                if result.returncode != 0:
+                    sp.fail("Fetch failed")
+                    if result.stderr.strip():
+                        print(result.stderr.strip())
+                else:
+                    sp.ok("Done")
+
         with status(f"Checking if '{branch_name}' has been merged or pushed") as sp:
-            merged = is_branch_merged(branch_name, parent_branch)
-            pushed = is_branch_tip_pushed(branch_name)
-            if not merged and not pushed:
+            if not is_branch_preserved(branch_name, parent_branch):
                 sp.fail("Unmerged changes")
                 print(f"Error: Branch '{branch_name}' contains unmerged changes.")
                 print(
@@ -581,15 +1001,17 @@ def destroy_worktree(branch_name, force=False):
 
     # Remove the worktree
     with status(f"Removing worktree at '{worktree_path}'") as sp:
-        run_command(f"git worktree remove --force '{worktree_path}'")
+        run_command(
+            ["git", "worktree", "remove", "--force", worktree_path], capture=False
+        )
         sp.ok("Done")
 
     # Delete the local branch
     with status(f"Deleting local branch '{branch_name}'") as sp:
         if force:
-            run_command(f"git branch -D {branch_name}")
+            run_command(["git", "branch", "-D", branch_name], capture=False)
         else:
-            run_command(f"git branch -d {branch_name}")
+            run_command(["git", "branch", "-d", branch_name], capture=False)
         sp.ok("Done")
 
     print(f"Successfully destroyed worktree and branch '{branch_name}'")